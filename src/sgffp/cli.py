@@ -6,32 +6,32 @@ Command-line interface for SGFF tools
 import sys
 import json
 import argparse
-import struct
+import mmap
 from importlib.metadata import version
 
-from .reader import SgffReader
+from .reader import SgffReader, map_file
 from .writer import SgffWriter
 from .internal import SgffObject
-from .parsers import SCHEME
+from .parsers import BLOCK_HEADER, FILE_HEADER, SCHEME
 
 PARSED_BLOCKS = set(SCHEME.keys())
 # Known block types intentionally not parsed (SnapGene regenerates on import)
 UNDECODED_BLOCKS = {2, 3, 13, 35}
 
 
-def _open_input(path):
+def _open_input(path, types=None):
     """Read SnapGene file from path or stdin"""
     if path == "-":
-        return SgffReader(sys.stdin.buffer).read()
-    return SgffReader.from_file(path)
+        return SgffReader(sys.stdin.buffer, types).read()
+    return SgffReader(path, types).read()
 
 
 def cmd_parse(args):
     """Parse SGFF file to JSON"""
     sgff = _open_input(args.input)
 
-    # Convert int keys to strings for JSON
-    blocks_json = {str(k): v for k, v in sgff.blocks.items()}
+    # int block keys are stringified by the JSON encoder itself
+    blocks_json = sgff.blocks
 
     # Stringify binary fields that aren't JSON-serializable
     for items in blocks_json.values():
@@ -53,7 +53,9 @@ def cmd_parse(args):
         with open(args.output, "w") as f:
             json.dump(output, f, indent=2)
     else:
-        print(json.dumps(output, indent=2))
+        # Stream to stdout rather than building the whole string first
+        json.dump(output, sys.stdout, indent=2)
+        sys.stdout.write("\n")
 
 
 def cmd_info(args):
@@ -104,7 +106,7 @@ def cmd_info(args):
         print(f"History: {n_tree} nodes")
 
     # Blocks summary
-    print(f"Blocks: {', '.join(str(t) for t in sorted(sgff.types))}")
+    print(f"Blocks: {', '.join(map(str, sorted(sgff.blocks)))}")
 
     if not verbose:
         return
@@ -170,9 +172,8 @@ def cmd_info(args):
 
 def cmd_filter(args):
     """Filter blocks and write new file"""
-    sgff = _open_input(args.input)
-
     keep_types = {int(t.strip()) for t in args.keep.split(",")}
+    sgff = _open_input(args.input, keep_types)
 
     filtered = SgffObject(cookie=sgff.cookie)
     for block_type in sgff.types:
@@ -235,31 +236,30 @@ def cmd_tree(args):
     _print_tree(tree.root, verbose=getattr(args, "verbose", False))
 
 
+def _map_input(path):
+    """Map input file read-only, or read stdin and non-regular files into memory"""
+    if path == "-":
+        return sys.stdin.buffer.read()
+    with open(path, "rb") as f:
+        return map_file(f)
+
+
 def cmd_check(args):
     """Check for unknown/new block types"""
+    # Only (offset, length) is kept per block; data is sliced on --dump
     found_blocks = {}
     unknown = []
 
-    if args.input == "-":
-        f = sys.stdin.buffer
-    else:
-        f = open(args.input, "rb")
-
+    data = _map_input(args.input)
     try:
-        f.read(1 + 4 + 8 + 6)  # Skip header + cookie
-
-        while True:
-            type_byte = f.read(1)
-            if not type_byte:
-                break
+        offset = FILE_HEADER.size  # Skip header + cookie
+        end = len(data)
 
-            block_type = type_byte[0]
-            block_length = struct.unpack(">I", f.read(4))[0]
-            block_data = f.read(block_length)
-
-            if block_type not in found_blocks:
-                found_blocks[block_type] = []
-            found_blocks[block_type].append(block_data)
+        while offset < end:
+            block_type, block_length = BLOCK_HEADER.unpack_from(data, offset)
+            offset += BLOCK_HEADER.size
+            found_blocks.setdefault(block_type, []).append((offset, block_length))
+            offset += block_length
 
             if (
                 block_type not in PARSED_BLOCKS
@@ -267,15 +267,31 @@ def cmd_check(args):
                 and block_type not in unknown
             ):
                 unknown.append(block_type)
+
+        _report_check(args, data, found_blocks, unknown)
     finally:
-        if args.input != "-":
-            f.close()
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+
+# Bytes hex-encoded per write, so large dumps never build one giant string
+_HEX_CHUNK = 1 << 16
+
+
+def _write_hex(data, start, stop):
+    """Write data[start:stop] as hex to stdout in bounded chunks"""
+    for pos in range(start, stop, _HEX_CHUNK):
+        sys.stdout.write(data[pos : min(pos + _HEX_CHUNK, stop)].hex())
+    sys.stdout.write("\n")
+
 
+def _report_check(args, data, found_blocks, unknown):
+    """Print cmd_check results"""
     if args.list:
         has_undecoded = any(bt in UNDECODED_BLOCKS for bt in found_blocks)
         has_new = bool(unknown)
 
-        for block_type in sorted(found_blocks.keys()):
+        for block_type in sorted(found_blocks):
             count = len(found_blocks[block_type])
             if block_type in UNDECODED_BLOCKS:
                 marker = "[*]"
@@ -295,9 +311,10 @@ def cmd_check(args):
     elif unknown:
         if args.dump:
             for block_type in sorted(unknown):
-                for block_data in found_blocks[block_type]:
-                    print(f"Block {block_type}: {len(block_data)} bytes")
-                    print(block_data.hex())
+                for offset, length in found_blocks[block_type]:
+                    stop = min(offset + length, len(data))
+                    print(f"Block {block_type}: {stop - offset} bytes")
+                    _write_hex(data, offset, stop)
                     print()
         else:
             print(f"Unknown blocks: {sorted(unknown)}")
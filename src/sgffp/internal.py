@@ -144,16 +144,12 @@ class SgffObject:
 
     def set(self, block_id: int, value: Any) -> None:
         """Add value to block type."""
-        if block_id not in self.blocks:
-            self.blocks[block_id] = []
-        self.blocks[block_id].append(value)
+        self.blocks.setdefault(block_id, []).append(value)
 
     def remove(self, block_id: int, idx: int = 0) -> bool:
         """Remove single item from block type"""
-        if block_id not in self.blocks:
-            return False
-        items = self.blocks[block_id]
-        if idx >= len(items):
+        items = self.blocks.get(block_id)
+        if items is None or idx >= len(items):
             return False
         items.pop(idx)
         if not items:
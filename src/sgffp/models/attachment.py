@@ -3,7 +3,7 @@ Attachment model for embedded file attachments (block 23)
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterable, Optional
 
 from .base import SgffListModel
 
@@ -146,15 +146,26 @@ class SgffAttachmentList(SgffListModel[SgffAttachment]):
             return 1
         return max(a.id for a in self.items) + 1
 
-    def add(self, item: SgffAttachment) -> None:
-        """Add attachment with auto-assigned ID if needed."""
+    def _prepare(self, item: SgffAttachment) -> None:
+        """Fill in auto-assigned ID and size."""
         if item.id == 0:
             item.id = self._next_id()
         if item.size == 0 and item.data:
             item.size = len(item.data)
+
+    def add(self, item: SgffAttachment) -> None:
+        """Add attachment with auto-assigned ID if needed."""
+        self._prepare(item)
         self.items.append(item)
         self._sync()
 
+    def extend(self, items: Iterable[SgffAttachment]) -> None:
+        """Add several attachments with a single sync."""
+        for item in items:
+            self._prepare(item)
+            self.items.append(item)
+        self._sync()
+
     def get_by_name(self, name: str) -> Optional[SgffAttachment]:
         """Find attachment by filename."""
         for att in self.items:
@@ -2,7 +2,7 @@
 Base classes for SGFF data models
 """
 
-from typing import Dict, List, Any, Optional, Iterator, TypeVar, Generic
+from typing import Dict, List, Any, Optional, Iterable, Iterator, TypeVar, Generic
 
 T = TypeVar("T")
 
@@ -84,6 +84,11 @@ class SgffListModel(SgffModel, Generic[T]):
         self.items.append(item)
         self._sync()
 
+    def extend(self, items: Iterable[T]) -> None:
+        """Add several items with a single sync."""
+        self.items.extend(items)
+        self._sync()
+
     def remove(self, idx: int) -> bool:
         """Remove item by index and sync."""
         if 0 <= idx < len(self.items):
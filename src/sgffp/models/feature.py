@@ -24,11 +24,12 @@ class SgffSegment:
     @classmethod
     def from_dict(cls, data: Dict) -> "SgffSegment":
         range_str = data.get("range", "1-1")
-        parts = [int(x) for x in range_str.split("-")]
+        first, _, last = range_str.partition("-")
+        start = int(first)
         extras = {k: v for k, v in data.items() if k not in _SEGMENT_KNOWN_KEYS}
         return cls(
-            start=parts[0] - 1,
-            end=parts[1] if len(parts) > 1 else parts[0],
+            start=start - 1,
+            end=int(last) if last else start,
             color=data.get("color"),
             type=data.get("type", "standard"),
             translated=data.get("translated") == "1",
@@ -73,9 +74,10 @@ class SgffFeature:
         return self.segments[-1].end
 
     def length(self, seq_len=None) -> int:
-        if self.end >= self.start:
-            return self.end - self.start
-        return seq_len - self.start + self.end
+        start, end = self.start, self.end
+        if end >= start:
+            return end - start
+        return seq_len - start + end
 
     @classmethod
     def from_dict(cls, data: Dict) -> "SgffFeature":
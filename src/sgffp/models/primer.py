@@ -76,7 +76,7 @@ class SgffBindingSite:
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class SgffPrimer:
     """Single primer definition"""
 
@@ -8,7 +8,7 @@ from typing import Dict, List, Any, Optional
 from .base import SgffListModel
 
 
-@dataclass
+@dataclass(slots=True)
 class SgffTraceClip:
     """Quality clip boundaries for trace data"""
 
@@ -26,7 +26,7 @@ class SgffTraceClip:
         return {"left": self.left, "right": self.right}
 
 
-@dataclass
+@dataclass(slots=True)
 class SgffTraceSamples:
     """Trace sample intensities for each channel"""
 
@@ -65,7 +65,7 @@ class SgffTraceSamples:
         return self.length
 
 
-@dataclass
+@dataclass(slots=True)
 class SgffTrace:
     """Single sequence trace (chromatogram)"""
 
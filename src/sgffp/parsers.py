@@ -8,63 +8,88 @@ import lzma
 import logging
 import json
 import zlib
-from io import BytesIO
+from sys import intern
 from typing import Dict, Tuple, Optional, Callable, Any, List
-
-import xmltodict
+from xml.parsers.expat import ExpatError
 
 logger = logging.getLogger(__name__)
 
+# Magic, header length, title, then the three cookie fields
+FILE_HEADER = struct.Struct(">BI8sHHH")
+U32 = struct.Struct(">I")
+# Block type byte and big-endian payload length preceding every TLV block
+BLOCK_HEADER = struct.Struct(">BI")
 
-def parse_blocks(stream) -> Dict[int, List[Any]]:
-    """Parse TLV blocks from stream."""
-    result: Dict[int, List[Any]] = {}
 
-    while True:
-        block_type, block_length = read_header(stream)
-        if block_type is None:
-            break
+def parse_blocks(stream, types=None) -> Dict[int, List[Any]]:
+    """Parse TLV blocks from stream, optionally keeping only the given types."""
+    data = stream.read()
+    return _walk_blocks(data, 0, len(data), types)
 
-        data = stream.read(block_length)
 
-        # Skip unknown blocks
-        parser = SCHEME.get(block_type)
+def _walk_blocks(
+    data: bytes, offset: int, end: int, types=None
+) -> Dict[int, List[Any]]:
+    """Parse TLV blocks from data[offset:end] by advancing an offset."""
+    result: Dict[int, List[Any]] = {}
+    if types is not None:
+        types = frozenset(types)
+
+    # Bound once: SCHEME stays live, but the loop avoids repeated lookups
+    get_parser = SCHEME.get
+    unpack_header = BLOCK_HEADER.unpack_from
+    header_size = BLOCK_HEADER.size
+
+    while offset < end:
+        block_type, block_length = unpack_header(data, offset)
+        start = offset + header_size
+        offset = start + block_length
+
+        # Filtered-out and unknown blocks are skipped before their payload
+        # is copied
+        if types is not None and block_type not in types:
+            continue
+
+        parser = get_parser(block_type)
         if parser is None:
             logger.debug(
                 "Skipping unknown block type %d (%d bytes)", block_type, block_length
             )
             continue
 
-        parsed = parser(data)
+        parsed = parser(data[start : min(offset, end)])
         if parsed is not None:
-            if block_type not in result:
-                result[block_type] = []
-            result[block_type].append(parsed)
+            result.setdefault(block_type, []).append(parsed)
 
     return result
 
 
 def read_header(stream) -> Tuple[Optional[int], Optional[int]]:
     """Read TLV block header."""
-    type_byte = stream.read(1)
-    if not type_byte:
+    header = stream.read(BLOCK_HEADER.size)
+    if not header:
         return None, None
-    return type_byte[0], struct.unpack(">I", stream.read(4))[0]
+    return BLOCK_HEADER.unpack(header)
+
+
+_BASES = b"GATC"
+
+# Each packed byte expands to four bases, high bits first.
+_OCTET_QUADS = tuple(
+    bytes(_BASES[(b >> shift) & 3] for shift in (6, 4, 2, 0)) for b in range(256)
+)
 
 
 def octet_to_dna(raw_data: bytes, base_count: int) -> bytes:
     """Convert 2-bit encoded DNA to ASCII sequence."""
-    bases = b"GATC"
-    result = bytearray()
-    for byte in raw_data:
-        remaining = base_count - len(result)
-        if remaining <= 0:
-            break
-        shifts = [6, 4, 2, 0] if remaining >= 4 else [6, 4, 2, 0][-remaining:]
-        for shift in shifts:
-            if len(result) < base_count:
-                result.append(bases[(byte >> shift) & 3])
-    return bytes(result[:base_count])
+    if base_count <= 0:
+        return b""
+    full, tail = divmod(base_count, 4)
+    result = b"".join(map(_OCTET_QUADS.__getitem__, raw_data[:full]))
+    if tail and len(raw_data) > full:
+        # A partial final byte is right-aligned: its low bits hold the bases
+        result += _OCTET_QUADS[raw_data[full]][4 - tail:]
+    return result
 
 
 # =============================================================================
@@ -96,11 +121,11 @@ _SECTION_DNA = 0x01
 _SECTION_IUPAC = 0x02
 _SECTION_NRUN = 0x03
 
-_IUPAC_TO_NIBBLE = {
+IUPAC_TO_NIBBLE = {
     "N": 0x04, "B": 0x05, "D": 0x06, "H": 0x07, "K": 0x08,
     "M": 0x09, "R": 0x0A, "S": 0x0B, "V": 0x0C, "W": 0x0D, "Y": 0x0E,
 }
-_NIBBLE_TO_IUPAC = {v: k for k, v in _IUPAC_TO_NIBBLE.items()}
+_NIBBLE_TO_IUPAC = {v: k for k, v in IUPAC_TO_NIBBLE.items()}
 
 
 def _decode_iupac_section(data: bytes, n_chars: int) -> str:
@@ -127,26 +152,28 @@ def _read_compressed_section(payload: bytes, offset: int, marker: int, count: in
     raise ValueError(f"unknown compressed-DNA section marker 0x{marker:02x}")
 
 
+# Fixed header through the first section's marker and count (see layout below)
+COMPRESSED_DNA_HEADER = struct.Struct(">IIBIIBI")
+U32_PAIR = struct.Struct(">II")
+
+
 def parse_compressed_dna(data: bytes) -> Dict[str, Any]:
     """Decode a compressed-DNA block (top-level type 1, or embedded in block 11).
 
         [cl][ul][stamp][chunks][lowercases][marker][count][section data...][lowercase pairs...]
          4   4    1       4         4         1      4
     """
-    offset = 0
-    _cl = struct.unpack(">I", data[offset:offset + 4])[0]
-    offset += 4
-    uncompressed_length = struct.unpack(">I", data[offset:offset + 4])[0]
-    offset += 4
-
-    writer_stamp = data[offset]
-    chunk_count = struct.unpack(">I", data[offset + 1:offset + 5])[0]
-    lowercase_count = struct.unpack(">I", data[offset + 5:offset + 9])[0]
-    first_marker = data[offset + 9]
-    first_count = struct.unpack(">I", data[offset + 10:offset + 14])[0]
-    offset += 14
-
-    payload = data[offset:]
+    (
+        _cl,
+        uncompressed_length,
+        writer_stamp,
+        chunk_count,
+        lowercase_count,
+        first_marker,
+        first_count,
+    ) = COMPRESSED_DNA_HEADER.unpack_from(data, 0)
+
+    payload = data[COMPRESSED_DNA_HEADER.size :]
     pay_off = 0
     parts: List[str] = []
 
@@ -156,8 +183,7 @@ def parse_compressed_dna(data: bytes) -> Dict[str, Any]:
         for _ in range(chunk_count - 1):
             if pay_off + 5 > len(payload):
                 break
-            marker = payload[pay_off]
-            count = struct.unpack(">I", payload[pay_off + 1:pay_off + 5])[0]
+            marker, count = BLOCK_HEADER.unpack_from(payload, pay_off)
             pay_off += 5
             chunk_str, pay_off = _read_compressed_section(payload, pay_off, marker, count)
             parts.append(chunk_str)
@@ -169,8 +195,7 @@ def parse_compressed_dna(data: bytes) -> Dict[str, Any]:
         for _ in range(lowercase_count):
             if pay_off + 8 > len(payload):
                 break
-            start = struct.unpack(">I", payload[pay_off:pay_off + 4])[0]
-            end = struct.unpack(">I", payload[pay_off + 4:pay_off + 8])[0]
+            start, end = U32_PAIR.unpack_from(payload, pay_off)
             pay_off += 8
             for i in range(start, min(end + 1, len(chars))):
                 chars[i] = chars[i].lower()
@@ -206,13 +231,23 @@ def _clean_xml_dict(obj: Any) -> Any:
         return obj
 
 
+def _xml_to_dict(data: bytes) -> Any:
+    """Parse UTF-8 XML bytes, decoding leniently only if expat rejects them."""
+    import xmltodict  # deferred: pulls in xml.sax, only needed for XML blocks
+
+    try:
+        # Forcing utf-8 matches what xmltodict does for str input
+        return xmltodict.parse(data, encoding="utf-8")
+    except ExpatError:
+        # Invalid UTF-8 sequences were historically dropped, not fatal
+        return xmltodict.parse(data.decode("utf-8", errors="ignore"))
+
+
 def parse_xml(data: bytes) -> Optional[Dict]:
     """Parse XML block into dict with clean JSON keys."""
     try:
-        xml_str = data.decode("utf-8", errors="ignore")
-        parsed = xmltodict.parse(xml_str)
-        return _clean_xml_dict(parsed)
-    except Exception as e:
+        return _clean_xml_dict(_xml_to_dict(data))
+    except ExpatError as e:
         logger.debug("Failed to parse XML: %s", e)
         return None
 
@@ -221,9 +256,8 @@ def parse_lzma_xml(data: bytes) -> Optional[Dict]:
     """Parse LZMA-compressed XML block into dict with clean JSON keys."""
     try:
         decompressed = lzma.decompress(data)
-        parsed = xmltodict.parse(decompressed.decode("utf-8", errors="ignore"))
-        return _clean_xml_dict(parsed)
-    except Exception as e:
+        return _clean_xml_dict(_xml_to_dict(decompressed))
+    except (lzma.LZMAError, ExpatError) as e:
         logger.debug("Failed to parse LZMA XML: %s", e)
         return None
 
@@ -233,7 +267,7 @@ def parse_lzma_json(data: bytes) -> Optional[Any]:
     try:
         decompressed = lzma.decompress(data)
         return json.loads(decompressed)
-    except Exception as e:
+    except (lzma.LZMAError, ValueError) as e:
         logger.debug("Failed to parse LZMA JSON: %s", e)
         return None
 
@@ -242,8 +276,8 @@ def parse_lzma_nested(data: bytes) -> Optional[Dict[int, List[Any]]]:
     """Parse LZMA-compressed block containing nested TLV blocks."""
     try:
         decompressed = lzma.decompress(data)
-        return parse_blocks(BytesIO(decompressed))
-    except Exception as e:
+        return _walk_blocks(decompressed, 0, len(decompressed))
+    except (lzma.LZMAError, struct.error, IndexError, ValueError) as e:
         logger.debug("Failed to parse LZMA nested blocks: %s", e)
         return None
 
@@ -366,6 +400,7 @@ def _extract_value(v: Dict) -> Any:
 # =============================================================================
 
 ZTR_MAGIC = b"\xaeZTR\r\n\x1a\n"
+TRACE_CHANNELS = ("A", "C", "G", "T")
 
 
 def _ztr_decompress(chunk_data: bytes) -> bytes:
@@ -383,15 +418,102 @@ def _ztr_decompress(chunk_data: bytes) -> bytes:
     if format_byte == 2 and len(chunk_data) > 5:
         try:
             return b"\x00" + zlib.decompress(chunk_data[5:])
-        except Exception:
+        except zlib.error:
             pass
 
     return chunk_data
 
 
+def _ztr_base(chunk_data: bytes, meta_data, result: Dict[str, Any]) -> None:
+    # Format byte + padding + ASCII bases
+    if len(chunk_data) > 1:
+        result["bases"] = chunk_data[2:].decode("ascii", errors="ignore")
+
+
+def _ztr_bpos(chunk_data: bytes, meta_data, result: Dict[str, Any]) -> None:
+    # Format byte + 3 padding + 4-byte positions
+    if len(chunk_data) > 4:
+        usable = 4 + (len(chunk_data) - 4) // 4 * 4
+        result["positions"] = [
+            pos for (pos,) in U32.iter_unpack(chunk_data[4:usable])
+        ]
+
+
+def _ztr_cnf4(chunk_data: bytes, meta_data, result: Dict[str, Any]) -> None:
+    # Format byte + confidence values (1 byte per base)
+    # First value is confidence of called base, then A/C/G/T values
+    if len(chunk_data) > 1:
+        result["confidence"] = list(chunk_data[1:])
+
+
+def _ztr_smp4(chunk_data: bytes, meta_data, result: Dict[str, Any]) -> None:
+    # Format byte + padding + interleaved ACGT 16-bit samples
+    if len(chunk_data) > 2:
+        sample_data = chunk_data[2:]
+        trace_len = len(sample_data) // 8  # 4 channels * 2 bytes
+        # Each channel is one contiguous run of big-endian u16 values
+        channel = struct.Struct(f">{trace_len}H")
+        samples: Dict[str, list] = {}
+        for i, base in enumerate(TRACE_CHANNELS):
+            samples[base] = list(channel.unpack_from(sample_data, i * channel.size))
+        result["samples"] = samples
+
+
+def _ztr_samp(chunk_data: bytes, meta_data, result: Dict[str, Any]) -> None:
+    # Metadata: 4-byte channel name (e.g., "A\x00\x00\x00")
+    # Data: Format byte + padding + 16-bit samples
+    if meta_data and len(chunk_data) > 2:
+        channel = meta_data[0:1].decode("ascii", errors="ignore")
+        if channel in "ACGT":
+            sample_data = chunk_data[2:]
+            count = len(sample_data) // 2
+            trace = list(struct.unpack_from(f">{count}H", sample_data))
+            result.setdefault("samples", {})[channel] = trace
+
+
+def _ztr_text(chunk_data: bytes, meta_data, result: Dict[str, Any]) -> None:
+    # Format byte + padding + null-terminated key-value pairs
+    if len(chunk_data) > 2:
+        text_str = chunk_data[2:].decode("ascii", errors="ignore")
+        # Pair consecutive items without slicing out the keys and values;
+        # keys come from a small fixed set, so share one copy across traces
+        items = iter(text_str.rstrip("\x00").split("\x00"))
+        result["text"] = {intern(key): val for key, val in zip(items, items) if key}
+
+
+def _ztr_clip(chunk_data: bytes, meta_data, result: Dict[str, Any]) -> None:
+    # Format byte + left (4) + right (4)
+    if len(chunk_data) >= 9:
+        result["clip"] = {
+            "left": U32.unpack_from(chunk_data, 1)[0],
+            "right": U32.unpack_from(chunk_data, 5)[0],
+        }
+
+
+def _ztr_comm(chunk_data: bytes, meta_data, result: Dict[str, Any]) -> None:
+    # Format byte + free text
+    if len(chunk_data) > 1:
+        comment = chunk_data[1:].decode("ascii", errors="ignore").rstrip("\x00")
+        result.setdefault("comments", []).append(comment)
+
+
+# Raw 4-byte chunk type -> handler(chunk_data, meta_data, result);
+# unknown chunks are skipped
+_ZTR_HANDLERS: Dict[bytes, Callable] = {
+    b"BASE": _ztr_base,
+    b"BPOS": _ztr_bpos,
+    b"CNF4": _ztr_cnf4,
+    b"SMP4": _ztr_smp4,
+    b"SAMP": _ztr_samp,
+    b"TEXT": _ztr_text,
+    b"CLIP": _ztr_clip,
+    b"COMM": _ztr_comm,
+}
+
+
 def parse_ztr(data: bytes) -> Optional[Dict[str, Any]]:
     """Parse ZTR format sequence trace data."""
-    if len(data) < 10 or data[:8] != ZTR_MAGIC:
+    if len(data) < 10 or not data.startswith(ZTR_MAGIC):
         return None
 
     result: Dict[str, Any] = {}
@@ -399,8 +521,8 @@ def parse_ztr(data: bytes) -> Optional[Dict[str, Any]]:
 
     while offset + 8 <= len(data):
         # Chunk header: type (4) + metadata_length (4)
-        chunk_type = data[offset : offset + 4].decode("ascii", errors="ignore").strip()
-        meta_len = struct.unpack(">I", data[offset + 4 : offset + 8])[0]
+        chunk_type = data[offset : offset + 4]
+        meta_len = U32.unpack_from(data, offset + 4)[0]
 
         # Store metadata if present (e.g., SAMP has 4-byte channel name)
         meta_data = data[offset + 8 : offset + 8 + meta_len] if meta_len > 0 else None
@@ -410,7 +532,7 @@ def parse_ztr(data: bytes) -> Optional[Dict[str, Any]]:
             break
 
         # Data length
-        data_len = struct.unpack(">I", data[offset : offset + 4])[0]
+        data_len = U32.unpack_from(data, offset)[0]
         offset += 4
 
         if offset + data_len > len(data):
@@ -419,80 +541,9 @@ def parse_ztr(data: bytes) -> Optional[Dict[str, Any]]:
         chunk_data = data[offset : offset + data_len]
         chunk_data = _ztr_decompress(chunk_data)
 
-        # Parse chunk based on type
-        if chunk_type == "BASE" and len(chunk_data) > 1:
-            # Format byte + padding + ASCII bases
-            result["bases"] = chunk_data[2:].decode("ascii", errors="ignore")
-
-        elif chunk_type == "BPOS" and len(chunk_data) > 4:
-            # Format byte + 3 padding + 4-byte positions
-            positions = []
-            for i in range(4, len(chunk_data), 4):
-                if i + 4 <= len(chunk_data):
-                    pos = struct.unpack(">I", chunk_data[i : i + 4])[0]
-                    positions.append(pos)
-            result["positions"] = positions
-
-        elif chunk_type == "CNF4" and len(chunk_data) > 1:
-            # Format byte + confidence values (1 byte per base)
-            # First value is confidence of called base, then A/C/G/T values
-            confidence = list(chunk_data[1:])
-            result["confidence"] = confidence
-
-        elif chunk_type == "SMP4" and len(chunk_data) > 2:
-            # Format byte + padding + interleaved ACGT 16-bit samples
-            sample_data = chunk_data[2:]
-            trace_len = len(sample_data) // 8  # 4 channels * 2 bytes
-            samples: Dict[str, list] = {"A": [], "C": [], "G": [], "T": []}
-            for i, base in enumerate(["A", "C", "G", "T"]):
-                start = i * trace_len * 2
-                for j in range(0, trace_len * 2, 2):
-                    if start + j + 2 <= len(sample_data):
-                        val = struct.unpack(
-                            ">H", sample_data[start + j : start + j + 2]
-                        )[0]
-                        samples[base].append(val)
-            result["samples"] = samples
-
-        elif chunk_type == "SAMP" and meta_data and len(chunk_data) > 2:
-            # Metadata: 4-byte channel name (e.g., "A\x00\x00\x00")
-            # Data: Format byte + padding + 16-bit samples
-            channel = meta_data[0:1].decode("ascii", errors="ignore")
-            if channel in "ACGT":
-                sample_data = chunk_data[2:]
-                trace = []
-                for j in range(0, len(sample_data), 2):
-                    if j + 2 <= len(sample_data):
-                        val = struct.unpack(">H", sample_data[j : j + 2])[0]
-                        trace.append(val)
-                if "samples" not in result:
-                    result["samples"] = {}
-                result["samples"][channel] = trace
-
-        elif chunk_type == "TEXT" and len(chunk_data) > 2:
-            # Format byte + padding + null-terminated key-value pairs
-            items = chunk_data[2:].rstrip(b"\x00").split(b"\x00")
-            text = {}
-            for i in range(0, len(items) - 1, 2):
-                key = items[i].decode("ascii", errors="ignore")
-                val = items[i + 1].decode("ascii", errors="ignore")
-                if key:
-                    text[key] = val
-            result["text"] = text
-
-        elif chunk_type == "CLIP" and len(chunk_data) >= 9:
-            # Format byte + left (4) + right (4)
-            result["clip"] = {
-                "left": struct.unpack(">I", chunk_data[1:5])[0],
-                "right": struct.unpack(">I", chunk_data[5:9])[0],
-            }
-
-        elif chunk_type == "COMM" and len(chunk_data) > 1:
-            # Format byte + free text
-            comment = chunk_data[1:].decode("ascii", errors="ignore").rstrip("\x00")
-            if "comments" not in result:
-                result["comments"] = []
-            result["comments"].append(comment)
+        handler = _ZTR_HANDLERS.get(chunk_type)
+        if handler is not None:
+            handler(chunk_data, meta_data, result)
 
         offset += data_len
 
@@ -509,12 +560,12 @@ def parse_trace_container(data: bytes) -> Dict[str, Any]:
     result: Dict[str, Any] = {}
 
     # 4-byte header flags
-    flags = struct.unpack(">I", data[:4])[0]
+    flags = U32.unpack_from(data, 0)[0]
     result["flags"] = flags
 
-    # Parse nested blocks from remaining data
+    # Walk nested blocks in place after the flags word
     if len(data) > 4:
-        nested = parse_blocks(BytesIO(data[4:]))
+        nested = _walk_blocks(data, 4, len(data))
         if nested:
             result["blocks"] = nested
 
@@ -539,7 +590,7 @@ def parse_attachment(data: bytes) -> Optional[Dict[str, Any]]:
         logger.debug("Attachment block too short (%d bytes)", len(data))
         return None
 
-    first_four = struct.unpack(">I", data[:4])[0]
+    first_four = int.from_bytes(data[:4], "big")
 
     if first_four == 0:
         # Manifest: 4 zero bytes + uint32 decompressed_size + zlib XML
@@ -548,9 +599,9 @@ def parse_attachment(data: bytes) -> Optional[Dict[str, Any]]:
             return None
         try:
             decompressed = zlib.decompress(data[8:])
-            parsed = xmltodict.parse(decompressed.decode("utf-8", errors="ignore"))
+            parsed = _xml_to_dict(decompressed)
             return {"_type": "manifest", "manifest": _clean_xml_dict(parsed)}
-        except Exception as e:
+        except (zlib.error, ExpatError) as e:
             logger.debug("Failed to parse attachment manifest: %s", e)
             return None
     else:
@@ -572,7 +623,7 @@ def parse_history_node(data: bytes) -> Dict[str, Any]:
     node = {}
     offset = 0
 
-    node["node_index"] = struct.unpack(">I", data[offset : offset + 4])[0]
+    node["node_index"] = U32.unpack_from(data, offset)[0]
     offset += 4
 
     seq_type = data[offset]
@@ -583,7 +634,7 @@ def parse_history_node(data: bytes) -> Dict[str, Any]:
     if seq_type == 29:
         if offset + 4 <= len(data):
             # Read 4-byte length of the XZ-compressed modifier XML
-            modifier_length = struct.unpack(">I", data[offset : offset + 4])[0]
+            modifier_length = U32.unpack_from(data, offset)[0]
             offset += 4
 
             modifier_data = data[offset : offset + modifier_length]
@@ -596,14 +647,14 @@ def parse_history_node(data: bytes) -> Dict[str, Any]:
 
             # Parse remaining data as nested TLV blocks
             if offset < len(data):
-                nested = parse_blocks(BytesIO(data[offset:]))
+                nested = _walk_blocks(data, offset, len(data))
                 if nested:
                     node["node_info"] = nested
         return node
 
     # Type 1: compressed DNA
     if seq_type == 1:
-        compressed_length = struct.unpack(">I", data[offset : offset + 4])[0]
+        compressed_length = U32.unpack_from(data, offset)[0]
         compressed_start = offset + 4
 
         block_data = data[offset : compressed_start + compressed_length]
@@ -615,7 +666,7 @@ def parse_history_node(data: bytes) -> Dict[str, Any]:
 
     # Types 0, 21, 32: uncompressed
     elif seq_type in [0, 21, 32]:
-        seq_length = struct.unpack(">I", data[offset : offset + 4])[0]
+        seq_length = U32.unpack_from(data, offset)[0]
         offset += 4
         node["sequence"] = data[offset : offset + seq_length].decode(
             "ascii", errors="ignore"
@@ -625,7 +676,7 @@ def parse_history_node(data: bytes) -> Dict[str, Any]:
 
     # Parse remaining nested blocks
     if offset < len(data):
-        nested = parse_blocks(BytesIO(data[offset:]))
+        nested = _walk_blocks(data, offset, len(data))
         if nested:
             node["node_info"] = nested
 
@@ -637,8 +688,8 @@ def parse_history_node(data: bytes) -> Dict[str, Any]:
 # =============================================================================
 
 BAM_MAGIC = b"BAM\x01"
-_BAM_SEQ_BASES = "=ACMGRSVTWYHKDBN"
-_BAM_CIGAR_OPS = "MIDNSHP=X"
+BAM_SEQ_BASES = "=ACMGRSVTWYHKDBN"
+BAM_CIGAR_OPS = "MIDNSHP=X"
 
 
 def _decompress_bgzf(data: bytes) -> bytes:
@@ -646,7 +697,7 @@ def _decompress_bgzf(data: bytes) -> bytes:
     result = bytearray()
     offset = 0
     while offset < len(data):
-        if data[offset : offset + 2] != b"\x1f\x8b":
+        if not data.startswith(b"\x1f\x8b", offset):
             break
         # BSIZE in BC extra field at offset 16-17
         bsize = struct.unpack("<H", data[offset + 16 : offset + 18])[0]
@@ -661,8 +712,8 @@ def _decode_bam_seq(data: bytes, l_seq: int) -> str:
     """Decode 4-bit packed BAM sequence to string."""
     result = []
     for b in data:
-        result.append(_BAM_SEQ_BASES[(b >> 4) & 0xF])
-        result.append(_BAM_SEQ_BASES[b & 0xF])
+        result.append(BAM_SEQ_BASES[(b >> 4) & 0xF])
+        result.append(BAM_SEQ_BASES[b & 0xF])
     return "".join(result[:l_seq])
 
 
@@ -671,7 +722,7 @@ def _decode_cigar(data: bytes, n_ops: int) -> str:
     parts = []
     for i in range(n_ops):
         val = struct.unpack("<I", data[i * 4 : i * 4 + 4])[0]
-        parts.append(f"{val >> 4}{_BAM_CIGAR_OPS[val & 0xF]}")
+        parts.append(f"{val >> 4}{BAM_CIGAR_OPS[val & 0xF]}")
     return "".join(parts)
 
 
@@ -729,7 +780,7 @@ def parse_trace_alignment(data: bytes) -> Optional[Dict[str, Any]]:
         logger.debug("Failed to decompress BGZF: %s", e)
         return None
 
-    if len(raw) < 4 or raw[:4] != BAM_MAGIC:
+    if not raw.startswith(BAM_MAGIC):
         logger.debug("Invalid BAM magic")
         return None
 
@@ -2,25 +2,44 @@
 SnapGene file reader
 """
 
-import struct
+import mmap
+import os
+import stat
 from io import BytesIO
-from typing import Union, BinaryIO
+from typing import Union, BinaryIO, Iterable, Optional
 from pathlib import Path
 
 from .internal import SgffObject, Cookie
-from .parsers import parse_blocks
+from .parsers import FILE_HEADER, _walk_blocks
+
+
+def map_file(f: BinaryIO):
+    """Map a regular file read-only; read pipes, FIFOs and empty files into memory"""
+    fd = f.fileno()
+    st = os.fstat(fd)
+    if stat.S_ISREG(st.st_mode) and st.st_size > 0:
+        try:
+            return mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            pass  # e.g. filesystems without mmap support
+    return f.read()
 
 
 class SgffReader:
     """Read and parse SnapGene files into SgffObject"""
 
-    def __init__(self, source: Union[str, Path, BinaryIO]):
-        if isinstance(source, (str, Path)):
-            self.stream = open(source, "rb")
-            self.should_close = True
-        else:
+    def __init__(
+        self, source: Union[str, Path, BinaryIO], types: Optional[Iterable[int]] = None
+    ):
+        self.types = types
+        try:
+            path = os.fspath(source)
+        except TypeError:
             self.stream = source
             self.should_close = False
+        else:
+            self.stream = open(path, "rb")
+            self.should_close = True
 
     def read(self) -> SgffObject:
         """Parse file and return SgffObject"""
@@ -32,22 +51,41 @@ class SgffReader:
 
     def _parse(self) -> SgffObject:
         """Internal parsing logic"""
-        if self.stream.read(1) != b"\t":
+        data = self._load()
+        try:
+            return self._parse_buffer(data)
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+    def _load(self):
+        """Map files opened by path, read everything else into memory"""
+        if self.should_close:
+            return map_file(self.stream)
+        return self.stream.read()
+
+    def _parse_buffer(self, data) -> SgffObject:
+        """Parse header, cookie and blocks from an in-memory buffer"""
+        if data[:1] != b"\t":
             raise ValueError("Invalid SnapGene file: wrong magic byte")
 
-        length = struct.unpack(">I", self.stream.read(4))[0]
-        title = self.stream.read(8)
+        if len(data) < FILE_HEADER.size:
+            raise ValueError("Invalid SnapGene file: truncated header")
+
+        _, length, title, seq_type, export_ver, import_ver = FILE_HEADER.unpack_from(
+            data, 0
+        )
 
         if length != 14 or title != b"SnapGene":
             raise ValueError("Invalid SnapGene file: wrong header")
 
         cookie = Cookie(
-            type_of_sequence=struct.unpack(">H", self.stream.read(2))[0],
-            export_version=struct.unpack(">H", self.stream.read(2))[0],
-            import_version=struct.unpack(">H", self.stream.read(2))[0],
+            type_of_sequence=seq_type,
+            export_version=export_ver,
+            import_version=import_ver,
         )
 
-        blocks = parse_blocks(self.stream)
+        blocks = _walk_blocks(data, FILE_HEADER.size, len(data), self.types)
 
         return SgffObject(cookie=cookie, blocks=blocks)
 
@@ -59,4 +97,7 @@ class SgffReader:
     @classmethod
     def from_bytes(cls, data: bytes) -> SgffObject:
         """Read from bytes"""
-        return cls(BytesIO(data)).read()
+        # Walk bytes in place; other buffers are copied once, as BytesIO did
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        return cls(BytesIO(data))._parse_buffer(data)
@@ -2,21 +2,83 @@
 SnapGene file writer
 """
 
+import functools
+import os
+import re
 import struct
+import threading
 import json
 import lzma
 import zlib
-from typing import Union, BinaryIO, Any, Dict
+from collections import OrderedDict
+from typing import Union, BinaryIO, Any, Callable, Dict, Iterator
 from pathlib import Path
 from io import BytesIO
 
-import xmltodict
-
 from .internal import SgffObject
+from .parsers import (
+    BAM_CIGAR_OPS,
+    BAM_MAGIC,
+    BAM_SEQ_BASES,
+    BLOCK_HEADER,
+    COMPRESSED_DNA_HEADER,
+    FILE_HEADER,
+    IUPAC_TO_NIBBLE,
+    STRAND_MAP,
+    TRACE_CHANNELS,
+    U32,
+    U32_PAIR,
+    ZTR_MAGIC,
+)
 
 # Uppercase keys that are XML attributes, not child elements
 _UPPERCASE_ATTRS = {"ID"}
 
+# Feature strand symbol -> directionality attribute
+_STRAND_REV = {strand: code for code, strand in STRAND_MAP.items()}
+
+_CIGAR_RE = re.compile(r"(\d+)([MIDNSHP=X])")
+_CIGAR_OP_CODES = {c: i for i, c in enumerate(BAM_CIGAR_OPS)}
+_BAM_SEQ_CODES = {c: i for i, c in enumerate(BAM_SEQ_BASES)}
+
+# History node: node index, sequence type
+_HISTORY_NODE_HEADER = struct.Struct(">IB")
+
+# Little-endian layouts used by BAM / BGZF
+_I32_LE = struct.Struct("<i")
+# ref_id, pos, bin_mq_nl, flag_nc, l_seq, next_ref_id, next_pos, tlen
+_BAM_RECORD_CORE = struct.Struct("<iiIIiiii")
+# Gzip member header with the BC extra subfield (XLEN 6, SLEN 2), minus BSIZE
+_BGZF_HEADER = b"\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff\x06\x00BC\x02\x00"
+_BGZF_BSIZE = struct.Struct("<H")
+_BGZF_FOOTER = struct.Struct("<II")  # CRC32, ISIZE
+
+# Large enough that the many small header/payload writes coalesce into few syscalls
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Serialized XML keyed by the block's JSON text; repeated blocks (templates,
+# batch writes) skip the xmltodict walk. Only JSON-native blocks are cached,
+# so equal text always means equal data. Oversized blocks are not cached, so
+# the LRU retains at most 256 keys of up to 64 KiB (16 MiB) plus their XML.
+# Shared by all writers; the lock guards lookups and evictions.
+_XML_CACHE: "OrderedDict[tuple, bytes]" = OrderedDict()
+_XML_CACHE_LOCK = threading.Lock()
+_XML_CACHE_SIZE = 256
+_XML_CACHE_MAX_KEY = 64 * 1024
+
+
+def _is_json_native(obj: Any) -> bool:
+    """True if obj round-trips through JSON unchanged (str keys, no tuples)."""
+    kind = type(obj)
+    if kind is dict:
+        return all(type(k) is str and _is_json_native(v) for k, v in obj.items())
+    if kind is list:
+        return all(_is_json_native(item) for item in obj)
+    return obj is None or kind in (str, int, float, bool)
+
+# Map each byte to its 2-bit GATC code; anything else packs as G (0)
+_DNA_CODES = bytes(max(b"GATC".find(b & 0xDF), 0) for b in range(256))
+
 
 def _qual_value_to_xml(v: object) -> dict:
     """Convert a qualifier value to xmltodict V element format."""
@@ -52,16 +114,191 @@ def _to_xmltodict(obj: Any) -> Any:
         return obj
 
 
+# Direct XML emission for blocks rebuilt on every write (Features). Mirrors
+# xmltodict.unparse(short_empty_elements=True) on clean dicts; anything it
+# does not model raises _XmlFallback so the caller can use xmltodict instead.
+_XML_TEXT_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+_XML_ATTR_ESCAPE = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;", "\n": "&#10;", "\r": "&#13;", "\t": "&#9;"}
+)
+_INVALID_XML_NAME = re.compile(r"^(?:[?!@#]|$)|[<>/\"'=\s]")
+
+
+_EMPTY_FEATURES_XML = b'<?xml version="1.0"?><Features/>'
+
+
+class _XmlFallback(Exception):
+    """Value needs xmltodict's general handling."""
+
+
+class _XmlFragment(str):
+    """Pre-rendered XML that _emit_xml inserts verbatim."""
+
+
+_VALID_XML_NAMES = set(_UPPERCASE_ATTRS)
+_VALID_XML_NAMES_MAX = 1024
+
+
+def _xml_name(name: Any) -> str:
+    """Validate an element or attribute name."""
+    if name in _VALID_XML_NAMES:
+        return name
+    if not isinstance(name, str) or _INVALID_XML_NAME.search(name):
+        raise _XmlFallback
+    # Names come from a small vocabulary; remember the good ones
+    if len(_VALID_XML_NAMES) < _VALID_XML_NAMES_MAX:
+        _VALID_XML_NAMES.add(name)
+    return name
+
+
+def _xml_str(value: Any) -> str:
+    """Convert a scalar to XML text the way xmltodict does."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    raise _XmlFallback
+
+
+def _xml_attr(value: Any) -> str:
+    """Escape and quote an attribute value (xml.sax.saxutils.quoteattr)."""
+    return _quote_xml_attr("" if value is None else _xml_str(value))
+
+
+# Labels, colors, ranges and qualifier names repeat across features and files
+@functools.lru_cache(maxsize=4096)
+def _quote_xml_attr(text: str) -> str:
+    """Escape and quote attribute text."""
+    text = text.translate(_XML_ATTR_ESCAPE)
+    if '"' not in text:
+        return f'"{text}"'
+    if "'" not in text:
+        return f"'{text}'"
+    return '"' + text.replace('"', "&quot;") + '"'
+
+
+@functools.lru_cache(maxsize=4096)
+def _escape_xml_text(text: str) -> str:
+    """Escape element text."""
+    return text.translate(_XML_TEXT_ESCAPE)
+
+
+def _render_qual_value(v: object) -> str:
+    """Render one qualifier value as a V element."""
+    if isinstance(v, int):
+        return f"<V int={_quote_xml_attr(str(v))}/>"
+    return f"<V text={_quote_xml_attr(str(v))}/>"
+
+
+def _render_qualifiers(quals: Dict) -> _XmlFragment:
+    """Render a qualifiers dict as consecutive Q elements."""
+    parts = []
+    for name, value in quals.items():
+        if isinstance(value, list):
+            values = "".join(map(_render_qual_value, value))
+        else:
+            values = _render_qual_value(value)
+        if values:
+            parts.append(f"<Q name={_xml_attr(name)}>{values}</Q>")
+        else:
+            parts.append(f"<Q name={_xml_attr(name)}/>")
+    return _XmlFragment("".join(parts))
+
+
+def _emit_xml(parts: list, tag: str, value: Any) -> None:
+    """Append one clean-dict element (or a list of them) to parts."""
+    if isinstance(value, _XmlFragment):
+        parts.append(value)
+        return
+    if isinstance(value, list):
+        for item in value:
+            if isinstance(item, list):
+                raise _XmlFallback  # xmltodict stringifies nested lists
+            _emit_xml(parts, tag, item)
+        return
+
+    text = None
+    children = ()
+    parts.append("<" + _xml_name(tag))
+    if isinstance(value, dict):
+        # Same attribute/child split as _to_xmltodict
+        has_text = "_text" in value
+        children = []
+        for key, item in value.items():
+            if key == "_text":
+                text = item
+                continue
+            name = _xml_name(key)
+            if has_text or name[0].islower() or name in _UPPERCASE_ATTRS:
+                parts.append(f" {name}={_xml_attr(item)}")
+            else:
+                children.append((name, item))
+    elif value is not None:
+        text = value
+
+    parts.append(">")
+    mark = len(parts)
+    for key, item in children:
+        _emit_xml(parts, key, item)
+    if text is not None:
+        text = _xml_str(text)
+        if text:
+            parts.append(_escape_xml_text(text))
+    if len(parts) == mark:
+        parts[-1] = "/>"
+    else:
+        parts.append(f"</{tag}>")
+
+
+def _write_ztr_chunk(
+    buf: BinaryIO, chunk_type: str, chunk_data: bytes, metadata: bytes = b""
+) -> None:
+    """Write one ZTR chunk: type, metadata length + metadata, data length + data."""
+    # Type (4 bytes, space-padded)
+    buf.write(chunk_type.encode("ascii").ljust(4)[:4])
+    buf.write(U32.pack(len(metadata)))
+    if metadata:
+        buf.write(metadata)
+    buf.write(U32.pack(len(chunk_data)))
+    buf.write(chunk_data)
+
+
 class SgffWriter:
     """Write SgffObject to SnapGene file format"""
 
     def __init__(self, target: Union[str, Path, BinaryIO]):
-        if isinstance(target, (str, Path)):
-            self.stream = open(target, "wb")
-            self.should_close = True
-        else:
+        try:
+            path = os.fspath(target)
+        except TypeError:
             self.stream = target
             self.should_close = False
+        else:
+            self.stream = open(path, "wb", buffering=_WRITE_BUFFER_SIZE)
+            self.should_close = True
+
+        # Dict serializers by block type; anything else is plain XML
+        self._dict_serializers: Dict[int, Callable[[Dict], bytes]] = {
+            0: self._serialize_sequence,
+            21: self._serialize_sequence,
+            32: self._serialize_sequence,
+            1: self._serialize_compressed_dna,
+            10: self._serialize_features,
+            7: self._serialize_lzma_xml,  # History tree
+            11: self._serialize_history_node,
+            29: self._serialize_lzma_xml,  # History modifier
+            30: self._serialize_lzma_nested,  # History content
+            16: self._serialize_trace_container,
+            18: self._serialize_ztr,
+            34: self._serialize_lzma_json,  # RNA structure predictions
+            23: self._serialize_attachment,
+            27: self._serialize_trace_alignment,
+            # XML blocks with declaration (matches SnapGene behavior)
+            5: self._serialize_declared_xml,
+            14: self._serialize_declared_xml,
+            28: self._serialize_declared_xml,
+        }
 
     def write(self, sgff: SgffObject) -> None:
         """Write SgffObject to file"""
@@ -73,27 +310,38 @@ class SgffWriter:
 
     def _write_file(self, sgff: SgffObject) -> None:
         """Internal writing logic"""
-        # Header
-        self.stream.write(b"\t")
-        self.stream.write(struct.pack(">I", 14))
-        self.stream.write(b"SnapGene")
-
-        # Cookie
-        self.stream.write(struct.pack(">H", sgff.cookie.type_of_sequence))
-        self.stream.write(struct.pack(">H", sgff.cookie.export_version))
-        self.stream.write(struct.pack(">H", sgff.cookie.import_version))
+        write = self.stream.write
+        for chunk in self._iter_chunks(sgff):
+            write(chunk)
+
+    def _iter_chunks(self, sgff: SgffObject) -> Iterator[bytes]:
+        """Yield the file as header, then block header/payload pairs."""
+        # Header + cookie
+        cookie = sgff.cookie
+        yield FILE_HEADER.pack(
+            0x09,
+            14,
+            b"SnapGene",
+            cookie.type_of_sequence,
+            cookie.export_version,
+            cookie.import_version,
+        )
 
         # Blocks sorted by type
-        for block_type in sorted(sgff.blocks.keys()):
-            for item in sgff.blocks[block_type]:
+        # Keys are unique, so sorting the items only ever compares block types
+        for block_type, items in sorted(sgff.blocks.items()):
+            for item in items:
                 block_data = self._serialize(block_type, item)
                 if block_data is not None:
-                    self.stream.write(bytes([block_type]))
-                    self.stream.write(struct.pack(">I", len(block_data)))
-                    self.stream.write(block_data)
+                    yield BLOCK_HEADER.pack(block_type, len(block_data))
+                    yield block_data
 
     def _serialize(self, block_type: int, data: Any) -> bytes:
         """Serialize block data to bytes"""
+        # Dict - type-specific serialization
+        if isinstance(data, dict):
+            return self._serialize_dict(block_type, data)
+
         # Already bytes
         if isinstance(data, bytes):
             return data
@@ -102,119 +350,78 @@ class SgffWriter:
         if isinstance(data, str):
             return data.encode("utf-8")
 
-        # Dict - type-specific serialization
-        if isinstance(data, dict):
-            return self._serialize_dict(block_type, data)
-
         raise ValueError(f"Cannot serialize {type(data)} for block {block_type}")
 
     def _serialize_dict(self, block_type: int, data: Dict) -> bytes:
         """Serialize dict data based on block type"""
-        # Sequence blocks (0, 21, 32)
-        if block_type in (0, 21, 32):
-            return self._serialize_sequence(data)
-
-        # Compressed DNA (1)
-        if block_type == 1:
-            return self._serialize_compressed_dna(data)
-
-        # Features (10)
-        if block_type == 10:
-            return self._serialize_features(data)
-
-        # History tree (7) - LZMA compressed XML
-        if block_type == 7:
-            return self._serialize_lzma_xml(data)
-
-        # History node (11) - binary format
-        if block_type == 11:
-            return self._serialize_history_node(data)
-
-        # History modifier (29) - LZMA compressed XML
-        if block_type == 29:
-            return self._serialize_lzma_xml(data)
-
-        # History content (30) - LZMA compressed nested TLV
-        if block_type == 30:
-            return self._serialize_lzma_nested(data)
-
-        # Trace container (16) - 4 byte flags + nested TLV blocks
-        if block_type == 16:
-            return self._serialize_trace_container(data)
-
-        # Trace (18) - ZTR binary format
-        if block_type == 18:
-            return self._serialize_ztr(data)
-
-        # RNA structure predictions (34) - LZMA JSON
-        if block_type == 34:
-            return self._serialize_lzma_json(data)
-
-        # File attachments (23) - file data or manifest
-        if block_type == 23:
-            return self._serialize_attachment(data)
-
-        # Trace alignment (27) - BGZF BAM
-        if block_type == 27:
-            return self._serialize_trace_alignment(data)
-
-        # XML blocks with declaration (matches SnapGene behavior)
-        if block_type in (5, 14, 28):
-            return self._serialize_xml(data, xml_declaration=True)
-
-        # XML blocks without declaration
-        if block_type in (6, 8, 17, 20):
+        serializer = self._dict_serializers.get(block_type)
+        if serializer is None:
+            # Default: XML without declaration (6, 8, 17, 20, unknown types)
             return self._serialize_xml(data)
+        return serializer(data)
 
-        # Default: try XML conversion
-        return self._serialize_xml(data)
+    def _serialize_declared_xml(self, data: Dict) -> bytes:
+        """Serialize dict to XML with a declaration."""
+        return self._serialize_xml(data, xml_declaration=True)
 
     def _serialize_sequence(self, data: Dict) -> bytes:
         """Serialize uncompressed sequence with property flags."""
-        props = 0
-        if data.get("topology") == "circular":
-            props |= 0x01
-        if data.get("strandedness") == "double":
-            props |= 0x02
-        if data.get("dam_methylated"):
-            props |= 0x04
-        if data.get("dcm_methylated"):
-            props |= 0x08
-        if data.get("ecoki_methylated"):
-            props |= 0x10
+        # Each condition contributes its bit directly (bools are 0/1)
+        props = (
+            (data.get("topology") == "circular")
+            | (data.get("strandedness") == "double") << 1
+            | bool(data.get("dam_methylated")) << 2
+            | bool(data.get("dcm_methylated")) << 3
+            | bool(data.get("ecoki_methylated")) << 4
+        )
 
         sequence = data.get("sequence", "")
-        return bytes([props]) + sequence.encode("utf-8")
+        if isinstance(sequence, (bytes, bytearray)):
+            return bytes((props,)) + sequence
+        try:
+            # Sequences are ASCII in practice; ascii skips the UTF-8 encoder
+            seq_bytes = sequence.encode("ascii")
+        except UnicodeEncodeError:
+            seq_bytes = sequence.encode("utf-8")
+        return bytes((props,)) + seq_bytes
 
     _DNA_BASES = frozenset("ACGT")
     _IUPAC_BASES = frozenset("BDHKMRSVWY")  # N handled separately as 0x03 N-run
 
     def _dna_to_octet(self, sequence: str) -> bytes:
         """Convert ACGT-only sequence to 2-bit GATC packed bytes."""
-        base_map = {"G": 0, "A": 1, "T": 2, "C": 3}
-        result = bytearray()
-        for i in range(0, len(sequence), 4):
-            chunk = sequence[i:i + 4]
-            byte = 0
-            shifts = [6, 4, 2, 0] if len(chunk) == 4 else [6, 4, 2, 0][-len(chunk):]
-            for base, shift in zip(chunk, shifts):
-                byte |= base_map.get(base.upper(), 0) << shift
-            result.append(byte)
-        return bytes(result)
+        codes = sequence.encode("ascii", errors="replace").translate(_DNA_CODES)
+        words, tail = divmod(len(codes), 4)
+        full = words * 4
+
+        # Treat every four codes as one big-endian 32-bit lane and fold the
+        # lanes in parallel on a single int: pairs first, then the halves,
+        # leaving each packed byte in the low byte of its lane
+        lanes = int.from_bytes(codes[:full], "big")
+        lanes = (lanes | lanes >> 6) & int.from_bytes(b"\x00\x0f" * 2 * words, "big")
+        lanes |= lanes >> 12
+        result = lanes.to_bytes(full, "big")[3::4]
+
+        if tail:
+            # A partial final byte is right-aligned: its low bits hold the bases
+            octet = 0
+            for code in codes[full:]:
+                octet = octet << 2 | code
+            result += bytes((octet,))
+        return result
 
     @staticmethod
     def _iupac_to_nibble_bytes(chars: str) -> bytes:
         """Pack IUPAC ambiguity codes 4-bit per char (2 chars per byte)."""
-        from .parsers import _IUPAC_TO_NIBBLE
         result = bytearray()
         n = len(chars)
         full = n // 2
         for i in range(full):
-            h = _IUPAC_TO_NIBBLE.get(chars[i * 2].upper(), 0x04)
-            low = _IUPAC_TO_NIBBLE.get(chars[i * 2 + 1].upper(), 0x04)
+            h = IUPAC_TO_NIBBLE.get(chars[i * 2].upper(), 0x04)
+            low = IUPAC_TO_NIBBLE.get(chars[i * 2 + 1].upper(), 0x04)
             result.append((h << 4) | low)
         if n % 2:
-            result.append(_IUPAC_TO_NIBBLE.get(chars[-1].upper(), 0x04))
+            result.append(IUPAC_TO_NIBBLE.get(chars[-1].upper(), 0x04))
         return bytes(result)
 
     @classmethod
@@ -280,45 +487,39 @@ class SgffWriter:
         first_marker, first_chars = sections[0]
         first_count = len(first_chars)
 
-        body = BytesIO()
+        parts = []
         # first section's data (no inline frame — its frame lives in the header)
         if first_marker == 0x01:
-            body.write(self._dna_to_octet(first_chars))
+            parts.append(self._dna_to_octet(first_chars))
         elif first_marker == 0x02:
-            body.write(self._iupac_to_nibble_bytes(first_chars))
+            parts.append(self._iupac_to_nibble_bytes(first_chars))
         # 0x03 N-run: zero data bytes
 
         # remaining sections: each carries its own marker + count + data
         for marker, chars in sections[1:]:
-            body.write(bytes([marker]))
-            body.write(struct.pack(">I", len(chars)))
+            parts.append(BLOCK_HEADER.pack(marker, len(chars)))
             if marker == 0x01:
-                body.write(self._dna_to_octet(chars))
+                parts.append(self._dna_to_octet(chars))
             elif marker == 0x02:
-                body.write(self._iupac_to_nibble_bytes(chars))
+                parts.append(self._iupac_to_nibble_bytes(chars))
 
         # lowercase ranges
-        for start, end in lowercase:
-            body.write(struct.pack(">I", start))
-            body.write(struct.pack(">I", end))
-
-        payload = body.getvalue()
+        parts.extend(U32_PAIR.pack(start, end) for start, end in lowercase)
 
-        # 14-byte descriptor
-        header = bytearray(14)
-        header[0] = writer_stamp & 0xFF
-        struct.pack_into(">I", header, 1, len(sections))
-        struct.pack_into(">I", header, 5, len(lowercase))
-        header[9] = first_marker
-        struct.pack_into(">I", header, 10, first_count)
+        payload = b"".join(parts)
 
+        # outer wrapper + 14-byte descriptor
         compressed_length = 4 + 14 + len(payload)
-        out = BytesIO()
-        out.write(struct.pack(">I", compressed_length))
-        out.write(struct.pack(">I", length))
-        out.write(bytes(header))
-        out.write(payload)
-        return out.getvalue()
+        header = COMPRESSED_DNA_HEADER.pack(
+            compressed_length,
+            length,
+            writer_stamp & 0xFF,
+            len(sections),
+            len(lowercase),
+            first_marker,
+            first_count,
+        )
+        return header + payload
 
     def _serialize_compressed_dna(self, data: Dict) -> bytes:
         """Serialize a top-level compressed DNA block (type 1)."""
@@ -330,14 +531,51 @@ class SgffWriter:
         """Serialize features to XML."""
         features = data.get("features", [])
         if not features:
-            xml_dict = {"Features": None}
-            xml_str = xmltodict.unparse(
-                xml_dict, full_document=False, short_empty_elements=True
-            )
-            return ('<?xml version="1.0"?>' + xml_str).encode("utf-8")
+            return _EMPTY_FEATURES_XML
 
-        strand_rev = {".": "0", "+": "1", "-": "2", "=": "3"}
         wrapper_extras = data.get("wrapper_extras", {})
+        try:
+            return self._emit_features(features, wrapper_extras)
+        except _XmlFallback:
+            return self._unparse_features(features, wrapper_extras)
+
+    def _emit_features(self, features: list, wrapper_extras: Dict) -> bytes:
+        """Write the Features XML directly from the clean feature dicts."""
+        nodes = []
+        for f in features:
+            extras = f.get("extras", {})
+            if "_text" in extras:
+                raise _XmlFallback  # would turn Segment/Q into attributes
+
+            # Feature-level extras first, then the modeled attrs and children,
+            # in the same key order the xmltodict path builds
+            node = dict(extras)
+            node["name"] = f.get("name", "")
+            node["type"] = f.get("type", "")
+            node["directionality"] = _STRAND_REV.get(f.get("strand", "."), "0")
+            if f.get("segments"):
+                node["Segment"] = f["segments"]
+            raw_quals = f.get("raw_qualifiers")
+            if raw_quals:
+                node["Q"] = raw_quals
+            else:
+                quals = f.get("qualifiers", {})
+                if quals:
+                    node["Q"] = _render_qualifiers(quals)
+            nodes.append(node)
+
+        if "_text" in wrapper_extras:
+            raise _XmlFallback
+        wrapper = dict(wrapper_extras)
+        wrapper["Feature"] = nodes
+
+        parts = ['<?xml version="1.0"?>']
+        _emit_xml(parts, "Features", wrapper)
+        return "".join(parts).encode("utf-8")
+
+    def _unparse_features(self, features: list, wrapper_extras: Dict) -> bytes:
+        """Serialize features through xmltodict."""
+        import xmltodict
 
         xml_features = []
         for f in features:
@@ -347,7 +585,7 @@ class SgffWriter:
             # Named feature attrs
             xml_f["@name"] = f.get("name", "")
             xml_f["@type"] = f.get("type", "")
-            xml_f["@directionality"] = strand_rev.get(f.get("strand", "."), "0")
+            xml_f["@directionality"] = _STRAND_REV.get(f.get("strand", "."), "0")
 
             # Segments
             if f.get("segments"):
@@ -397,9 +635,11 @@ class SgffWriter:
         if block_subtype == "file":
             file_id = data["id"]
             file_data = data["data"]
-            return struct.pack(">I", file_id) + file_data
+            return U32.pack(file_id) + file_data
 
         if block_subtype == "manifest":
+            import xmltodict
+
             manifest = data["manifest"]
             xml_data = _to_xmltodict(manifest)
             xml_str = xmltodict.unparse(
@@ -408,11 +648,7 @@ class SgffWriter:
             xml_bytes = xml_str.encode("utf-8")
             compressed = zlib.compress(xml_bytes)
             decompressed_size = len(xml_bytes)
-            return (
-                struct.pack(">I", 0)
-                + struct.pack(">I", decompressed_size)
-                + compressed
-            )
+            return U32_PAIR.pack(0, decompressed_size) + compressed
 
         raise ValueError(f"Unknown attachment sub-type: {block_subtype}")
 
@@ -424,25 +660,23 @@ class SgffWriter:
 
         # Build BAM header block
         header_buf = BytesIO()
-        header_buf.write(b"BAM\x01")
+        header_buf.write(BAM_MAGIC)
         header_bytes = header_text.encode("ascii")
-        header_buf.write(struct.pack("<i", len(header_bytes)))
+        header_buf.write(_I32_LE.pack(len(header_bytes)))
         header_buf.write(header_bytes)
-        header_buf.write(struct.pack("<i", len(references)))
+        header_buf.write(_I32_LE.pack(len(references)))
         for ref in references:
             name = ref.get("name", "")
             name_bytes = name.encode("ascii") + b"\x00"
-            header_buf.write(struct.pack("<i", len(name_bytes)))
+            header_buf.write(_I32_LE.pack(len(name_bytes)))
             header_buf.write(name_bytes)
-            header_buf.write(struct.pack("<i", ref.get("length", 0)))
+            header_buf.write(_I32_LE.pack(ref.get("length", 0)))
         header_data = header_buf.getvalue()
 
         # Build alignment records
         records_buf = BytesIO()
         for rec in records:
             rec_buf = BytesIO()
-            rec_buf.write(struct.pack("<i", rec.get("ref_id", 0)))
-            rec_buf.write(struct.pack("<i", rec.get("pos", 0)))
 
             read_name = rec.get("read_name", "")
             read_name_bytes = read_name.encode("ascii") + b"\x00"
@@ -454,23 +688,27 @@ class SgffWriter:
             mapq = rec.get("mapq", 255)
             bam_bin = rec.get("bin", 0)
             bin_mq_nl = (bam_bin << 16) | (mapq << 8) | l_read_name
-            rec_buf.write(struct.pack("<I", bin_mq_nl))
 
             flag = rec.get("flag", 0)
             flag_nc = (flag << 16) | n_cigar_op
-            rec_buf.write(struct.pack("<I", flag_nc))
 
             sequence = rec.get("sequence", "")
             l_seq = len(sequence)
-            rec_buf.write(struct.pack("<i", l_seq))
-            rec_buf.write(struct.pack("<i", rec.get("next_ref_id", 0)))
-            rec_buf.write(struct.pack("<i", rec.get("next_pos", 0)))
-            rec_buf.write(struct.pack("<i", rec.get("tlen", 0)))
+            rec_buf.write(
+                _BAM_RECORD_CORE.pack(
+                    rec.get("ref_id", 0),
+                    rec.get("pos", 0),
+                    bin_mq_nl,
+                    flag_nc,
+                    l_seq,
+                    rec.get("next_ref_id", 0),
+                    rec.get("next_pos", 0),
+                    rec.get("tlen", 0),
+                )
+            )
 
             rec_buf.write(read_name_bytes)
-
-            for op in cigar_ops:
-                rec_buf.write(struct.pack("<I", op))
+            rec_buf.write(struct.pack(f"<{n_cigar_op}I", *cigar_ops))
 
             rec_buf.write(self._encode_bam_seq(sequence))
 
@@ -481,7 +719,7 @@ class SgffWriter:
                 rec_buf.write(b"\xff" * l_seq)
 
             rec_data = rec_buf.getvalue()
-            records_buf.write(struct.pack("<i", len(rec_data)))
+            records_buf.write(_I32_LE.pack(len(rec_data)))
             records_buf.write(rec_data)
 
         records_data = records_buf.getvalue()
@@ -493,33 +731,32 @@ class SgffWriter:
             result.write(self._bgzf_compress(records_data))
         # EOF marker
         result.write(
-            b"\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff"
-            b"\x06\x00BC\x02\x00\x1b\x00"
-            b"\x03\x00\x00\x00\x00\x00\x00\x00\x00\x00"
+            _BGZF_HEADER
+            + _BGZF_BSIZE.pack(0x1B)
+            + b"\x03\x00"
+            + _BGZF_FOOTER.pack(0, 0)
         )
         return result.getvalue()
 
     @staticmethod
     def _encode_cigar(cigar_str: str) -> list:
         """Encode CIGAR string to list of uint32 BAM CIGAR ops."""
-        import re
-
-        ops_map = {c: i for i, c in enumerate("MIDNSHP=X")}
         result = []
-        for match in re.finditer(r"(\d+)([MIDNSHP=X])", cigar_str):
+        for match in _CIGAR_RE.finditer(cigar_str):
             length = int(match.group(1))
-            op = ops_map[match.group(2)]
+            op = _CIGAR_OP_CODES[match.group(2)]
             result.append((length << 4) | op)
         return result
 
     @staticmethod
     def _encode_bam_seq(sequence: str) -> bytes:
         """Encode sequence string to 4-bit packed BAM format."""
-        seq_map = {c: i for i, c in enumerate("=ACMGRSVTWYHKDBN")}
         result = bytearray()
         for i in range(0, len(sequence), 2):
-            high = seq_map.get(sequence[i], 15)
-            low = seq_map.get(sequence[i + 1], 15) if i + 1 < len(sequence) else 0
+            high = _BAM_SEQ_CODES.get(sequence[i], 15)
+            low = (
+                _BAM_SEQ_CODES.get(sequence[i + 1], 15) if i + 1 < len(sequence) else 0
+            )
             result.append((high << 4) | low)
         return bytes(result)
 
@@ -532,30 +769,39 @@ class SgffWriter:
 
         # BGZF block: gzip header with BC extra field + compressed + gzip footer
         bsize = 18 + len(compressed) + 8 - 1  # total block size - 1
-        buf = BytesIO()
-        # Gzip header
-        buf.write(b"\x1f\x8b")  # magic
-        buf.write(b"\x08")  # compression method (deflate)
-        buf.write(b"\x04")  # flags (FEXTRA)
-        buf.write(b"\x00\x00\x00\x00")  # mtime
-        buf.write(b"\x00")  # xfl
-        buf.write(b"\xff")  # OS (unknown)
-        # Extra field
-        buf.write(struct.pack("<H", 6))  # XLEN
-        buf.write(b"BC")  # subfield ID
-        buf.write(struct.pack("<H", 2))  # subfield length
-        buf.write(struct.pack("<H", bsize))  # BSIZE
-        # Compressed data
-        buf.write(compressed)
-        # Gzip footer
-        buf.write(struct.pack("<I", zlib.crc32(data) & 0xFFFFFFFF))
-        buf.write(struct.pack("<I", len(data) & 0xFFFFFFFF))
-        return buf.getvalue()
+        footer = _BGZF_FOOTER.pack(zlib.crc32(data), len(data) & 0xFFFFFFFF)
+        return _BGZF_HEADER + _BGZF_BSIZE.pack(bsize) + compressed + footer
 
     def _serialize_xml(
         self, data: Dict, *, xml_declaration: bool = False
     ) -> bytes:
-        """Serialize dict to XML."""
+        """Serialize dict to XML, reusing output for previously seen blocks."""
+        if not _is_json_native(data):
+            return self._unparse_xml(data, xml_declaration)
+        text = json.dumps(data, separators=(",", ":"))
+        if len(text) > _XML_CACHE_MAX_KEY:
+            return self._unparse_xml(data, xml_declaration)
+
+        key = (text, xml_declaration)
+        with _XML_CACHE_LOCK:
+            cached = _XML_CACHE.get(key)
+            if cached is not None:
+                _XML_CACHE.move_to_end(key)
+                return cached
+
+        # Unparse outside the lock from the caller's dict, not the JSON text
+        cached = self._unparse_xml(data, xml_declaration)
+        with _XML_CACHE_LOCK:
+            _XML_CACHE[key] = cached
+            if len(_XML_CACHE) > _XML_CACHE_SIZE:
+                _XML_CACHE.popitem(last=False)  # evict least recently used
+        return cached
+
+    @staticmethod
+    def _unparse_xml(data: Dict, xml_declaration: bool) -> bytes:
+        """Convert dict to XML bytes via xmltodict."""
+        import xmltodict
+
         try:
             xml_data = _to_xmltodict(data)
             xml_str = xmltodict.unparse(
@@ -564,11 +810,13 @@ class SgffWriter:
             if xml_declaration:
                 xml_str = '<?xml version="1.0"?>' + xml_str
             return xml_str.encode("utf-8")
-        except Exception:
-            raise ValueError("Cannot serialize dict to XML")
+        except (TypeError, ValueError, AttributeError) as e:
+            raise ValueError("Cannot serialize dict to XML") from e
 
     def _serialize_lzma_xml(self, data: Dict) -> bytes:
         """Serialize dict to LZMA-compressed XML."""
+        import xmltodict
+
         xml_data = _to_xmltodict(data)
         xml_str = xmltodict.unparse(
             xml_data, full_document=False, short_empty_elements=True
@@ -588,8 +836,7 @@ class SgffWriter:
         node_index = data.get("node_index", 0)
         seq_type = data.get("sequence_type", 0)
 
-        buf.write(struct.pack(">I", node_index))
-        buf.write(bytes([seq_type]))
+        buf.write(_HISTORY_NODE_HEADER.pack(node_index, seq_type))
 
         if seq_type == 1:
             # Compressed DNA — built from the sequence using section-based encoding
@@ -601,7 +848,7 @@ class SgffWriter:
             # Uncompressed sequence
             sequence = data.get("sequence", "")
             seq_bytes = sequence.encode("ascii", errors="ignore")
-            buf.write(struct.pack(">I", len(seq_bytes)))
+            buf.write(U32.pack(len(seq_bytes)))
             buf.write(seq_bytes)
 
         # seq_type == 29: LZMA/XZ compressed modifier blob
@@ -609,7 +856,7 @@ class SgffWriter:
             modifier = data.get("modifier")
             if modifier is not None:
                 modifier_bytes = self._serialize_lzma_xml(modifier)
-                buf.write(struct.pack(">I", len(modifier_bytes)))
+                buf.write(U32.pack(len(modifier_bytes)))
                 buf.write(modifier_bytes)
 
         # Nested node_info — bare TLV blocks (not LZMA-wrapped)
@@ -621,8 +868,7 @@ class SgffWriter:
                 for item in items:
                     block_data = self._serialize(block_type, item)
                     if block_data:
-                        buf.write(bytes([block_type]))
-                        buf.write(struct.pack(">I", len(block_data)))
+                        buf.write(BLOCK_HEADER.pack(block_type, len(block_data)))
                         buf.write(block_data)
 
         return buf.getvalue()
@@ -633,18 +879,17 @@ class SgffWriter:
 
         # 4-byte flags header
         flags = data.get("flags", 0)
-        buf.write(struct.pack(">I", flags))
+        buf.write(U32.pack(flags))
 
         # Nested blocks (typically block 18 trace + optional block 8 properties)
         nested = data.get("blocks", {})
-        for block_type in sorted(nested.keys()):
+        for block_type, items in sorted(nested.items()):
             if not isinstance(block_type, int):
                 continue
-            for item in nested[block_type]:
+            for item in items:
                 block_data = self._serialize(block_type, item)
                 if block_data:
-                    buf.write(bytes([block_type]))
-                    buf.write(struct.pack(">I", len(block_data)))
+                    buf.write(BLOCK_HEADER.pack(block_type, len(block_data)))
                     buf.write(block_data)
 
         return buf.getvalue()
@@ -660,8 +905,7 @@ class SgffWriter:
             for item in items:
                 block_data = self._serialize(block_type, item)
                 if block_data:
-                    buf.write(bytes([block_type]))
-                    buf.write(struct.pack(">I", len(block_data)))
+                    buf.write(BLOCK_HEADER.pack(block_type, len(block_data)))
                     buf.write(block_data)
 
         return lzma.compress(buf.getvalue())
@@ -671,62 +915,50 @@ class SgffWriter:
         buf = BytesIO()
 
         # ZTR magic and version
-        buf.write(b"\xaeZTR\r\n\x1a\n")  # Magic
-        buf.write(struct.pack(">BB", 1, 2))  # Version 1.2
-
-        # Helper to write a chunk
-        def write_chunk(chunk_type: str, chunk_data: bytes, metadata: bytes = b""):
-            # Type (4 bytes, space-padded)
-            type_bytes = chunk_type.encode("ascii").ljust(4)[:4]
-            buf.write(type_bytes)
-            # Metadata length + metadata
-            buf.write(struct.pack(">I", len(metadata)))
-            if metadata:
-                buf.write(metadata)
-            # Data length + data
-            buf.write(struct.pack(">I", len(chunk_data)))
-            buf.write(chunk_data)
+        buf.write(ZTR_MAGIC)
+        buf.write(b"\x01\x02")  # Version 1.2
 
         # BASE chunk: format byte (0) + padding (1) + ASCII bases
         if data.get("bases"):
             bases = data["bases"].encode("ascii")
             chunk_data = b"\x00\x00" + bases
-            write_chunk("BASE", chunk_data)
+            _write_ztr_chunk(buf, "BASE", chunk_data)
 
         # BPOS chunk: format byte (0) + 3 padding + 4-byte positions
         if data.get("positions"):
             positions = data["positions"]
-            chunk_data = b"\x00\x00\x00\x00"
-            for pos in positions:
-                chunk_data += struct.pack(">I", pos)
-            write_chunk("BPOS", chunk_data)
+            chunk_data = b"\x00\x00\x00\x00" + struct.pack(
+                f">{len(positions)}I", *positions
+            )
+            _write_ztr_chunk(buf, "BPOS", chunk_data)
 
         # CNF4 chunk: format byte (0) + confidence values (1 byte per base)
         if data.get("confidence"):
             confidence = data["confidence"]
             chunk_data = b"\x00" + bytes(confidence)
-            write_chunk("CNF4", chunk_data)
+            _write_ztr_chunk(buf, "CNF4", chunk_data)
 
         # SMP4 chunk: format byte (0) + padding + channel data
         if data.get("samples"):
             samples = data["samples"]
             # Check if all channels present (use SMP4), otherwise use SAMP
-            if all(ch in samples for ch in ["A", "C", "G", "T"]):
-                chunk_data = b"\x00\x00"
-                for channel in ["A", "C", "G", "T"]:
-                    for val in samples.get(channel, []):
-                        chunk_data += struct.pack(">H", val)
-                write_chunk("SMP4", chunk_data)
+            if all(ch in samples for ch in TRACE_CHANNELS):
+                channels = [samples[channel] for channel in TRACE_CHANNELS]
+                chunk_data = b"\x00\x00" + b"".join(
+                    struct.pack(f">{len(values)}H", *values) for values in channels
+                )
+                _write_ztr_chunk(buf, "SMP4", chunk_data)
             else:
                 # Individual SAMP chunks per channel
-                for channel in ["A", "C", "G", "T"]:
+                for channel in TRACE_CHANNELS:
                     if samples.get(channel):
-                        chunk_data = b"\x00\x00"
-                        for val in samples[channel]:
-                            chunk_data += struct.pack(">H", val)
+                        values = samples[channel]
+                        chunk_data = b"\x00\x00" + struct.pack(
+                            f">{len(values)}H", *values
+                        )
                         # Metadata is 4-byte channel name
                         metadata = channel.encode("ascii") + b"\x00\x00\x00"
-                        write_chunk("SAMP", chunk_data, metadata)
+                        _write_ztr_chunk(buf, "SAMP", chunk_data, metadata)
 
         # TEXT chunk: format byte (0) + padding + null-terminated key-value pairs
         if data.get("text"):
@@ -734,21 +966,21 @@ class SgffWriter:
             for key, val in data["text"].items():
                 text_data += key.encode("ascii") + b"\x00"
                 text_data += str(val).encode("ascii") + b"\x00"
-            write_chunk("TEXT", text_data)
+            _write_ztr_chunk(buf, "TEXT", text_data)
 
         # CLIP chunk: format byte (0) + left (4) + right (4)
         if data.get("clip"):
             clip = data["clip"]
-            chunk_data = b"\x00"
-            chunk_data += struct.pack(">I", clip.get("left", 0))
-            chunk_data += struct.pack(">I", clip.get("right", 0))
-            write_chunk("CLIP", chunk_data)
+            chunk_data = b"\x00" + U32_PAIR.pack(
+                clip.get("left", 0), clip.get("right", 0)
+            )
+            _write_ztr_chunk(buf, "CLIP", chunk_data)
 
         # COMM chunks: format byte (0) + free text
         if data.get("comments"):
             for comment in data["comments"]:
                 chunk_data = b"\x00" + comment.encode("ascii")
-                write_chunk("COMM", chunk_data)
+                _write_ztr_chunk(buf, "COMM", chunk_data)
 
         return buf.getvalue()
 
@@ -760,6 +992,5 @@ class SgffWriter:
     @classmethod
     def to_bytes(cls, sgff: SgffObject) -> bytes:
         """Write to bytes"""
-        stream = BytesIO()
-        cls(stream).write(sgff)
-        return stream.getvalue()
+        # Serialized blocks are joined into one buffer in a single copy
+        return b"".join(cls(BytesIO())._iter_chunks(sgff))
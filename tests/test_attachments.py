@@ -198,6 +198,17 @@ class TestSgffAttachmentList:
         assert al[0].id == 1
         assert al[1].id == 2
 
+    def test_extend_assigns_ids(self):
+        blocks = {}
+        al = SgffAttachmentList(blocks)
+        al.extend([
+            SgffAttachment(name="a.txt", data=b"a"),
+            SgffAttachment(name="b.txt", data=b"bb"),
+        ])
+        assert [a.id for a in al] == [1, 2]
+        assert [a.size for a in al] == [1, 2]
+        assert 23 in blocks
+
     def test_remove(self):
         blocks = {}
         al = SgffAttachmentList(blocks)
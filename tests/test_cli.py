@@ -3,9 +3,12 @@ Tests for CLI commands
 """
 
 import json
+import os
+import struct
 import subprocess
 import sys
 import tempfile
+import threading
 from io import BytesIO
 from pathlib import Path
 from unittest.mock import patch
@@ -134,12 +137,55 @@ class TestCheckCommand:
         # Format: "  0:  1"
         assert ":" in captured.out
 
+    @pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="requires os.mkfifo")
+    def test_check_fifo_input(self, test_dna, tmp_path, capsys):
+        """Check reads inputs that cannot be mapped, like FIFOs"""
+        fifo = tmp_path / "input.dna"
+        os.mkfifo(fifo)
+        data = test_dna.read_bytes()
+
+        def feed():
+            with open(fifo, "wb") as f:
+                f.write(data)
+
+        writer = threading.Thread(target=feed)
+        writer.start()
+        try:
+            cmd_check(MockArgs(input=str(fifo), list=True, dump=False))
+        finally:
+            writer.join()
+
+        from_fifo = capsys.readouterr().out
+        cmd_check(MockArgs(input=str(test_dna), list=True, dump=False))
+        assert from_fifo == capsys.readouterr().out
+
     def test_check_without_flags(self, test_dna, capsys):
         """Check without flags runs without error"""
         args = MockArgs(input=str(test_dna), list=False, dump=False)
         cmd_check(args)
         # Should not raise an exception
 
+    def test_check_dumps_unknown_block(self, tmp_path, capsys):
+        """Dump prints the hex payload of unknown blocks"""
+        data = (
+            b"\t"
+            + struct.pack(">I", 14)
+            + b"SnapGene"
+            + struct.pack(">HHH", 1, 16, 8)
+            + bytes([99])
+            + struct.pack(">I", 3)
+            + b"abc"
+        )
+        path = tmp_path / "unknown.dna"
+        path.write_bytes(data)
+
+        args = MockArgs(input=str(path), list=False, dump=True)
+        cmd_check(args)
+
+        captured = capsys.readouterr()
+        assert "Block 99: 3 bytes" in captured.out
+        assert "616263" in captured.out
+
 
 # =============================================================================
 # Tree Command Tests
@@ -151,6 +151,14 @@ class TestSgffFeatureList:
         assert len(fl) == 1
         assert len(blocks[10][0]["features"]) == 1
 
+    def test_extend_features(self):
+        """Extend adds every feature to blocks"""
+        blocks = {10: [{"features": []}]}
+        fl = SgffFeatureList(blocks)
+        fl.extend([SgffFeature(name="A", type="gene"), SgffFeature(name="B", type="CDS")])
+        assert [f.name for f in fl] == ["A", "B"]
+        assert len(blocks[10][0]["features"]) == 2
+
     def test_remove_feature(self):
         """Remove feature updates blocks"""
         blocks = {10: [{"features": [{"name": "A", "type": "gene", "segments": []}]}]}
@@ -1469,6 +1477,12 @@ class TestSgffSegmentExtras:
         assert result["type"] == "standard"
         assert "translated" not in result
 
+    def test_segment_single_position_range(self):
+        """Range without a dash is a single base"""
+        segment = SgffSegment.from_dict({"range": "7"})
+        assert segment.start == 6
+        assert segment.end == 7
+
     def test_segment_gap_type(self):
         """Gap segment type roundtrips"""
         segment = SgffSegment.from_dict({"range": "1-10", "type": "gap"})
@@ -6,6 +6,7 @@ import struct
 import lzma
 from io import BytesIO
 
+import pytest
 
 from sgffp.parsers import (
     parse_blocks,
@@ -21,6 +22,7 @@ from sgffp.parsers import (
     parse_ztr,
     parse_history_node,
     parse_trace_alignment,
+    parse_trace_container,
     SCHEME,
     ZTR_MAGIC,
 )
@@ -88,6 +90,18 @@ class TestOctetToDna:
         result = octet_to_dna(raw, 4)
         assert result == b"CCCC"
 
+    def test_octet_to_dna_partial_after_full_bytes(self):
+        """Full bytes decode high-bits-first, the tail byte right-aligned"""
+        raw = bytes([0b00011011, 0b00000001])
+        result = octet_to_dna(raw, 6)
+        assert result == b"GATCGA"
+
+    def test_octet_to_dna_short_input(self):
+        """Missing bytes yield a shorter result instead of padding"""
+        raw = bytes([0b00011011])
+        result = octet_to_dna(raw, 7)
+        assert result == b"GATC"
+
 
 # =============================================================================
 # Sequence Parser Tests
@@ -190,6 +204,22 @@ def _build_compressed_block(
     )
 
 
+def _ztr_chunk(chunk_type: bytes, chunk: bytes, meta: bytes = b"") -> bytes:
+    """Assemble one ZTR chunk: type + metadata length/bytes + data length/bytes."""
+    return (
+        chunk_type
+        + struct.pack(">I", len(meta))
+        + meta
+        + struct.pack(">I", len(chunk))
+        + chunk
+    )
+
+
+def _ztr(*chunks: bytes) -> bytes:
+    """Assemble a ZTR trace: magic + version + chunks."""
+    return ZTR_MAGIC + b"\x01\x02" + b"".join(chunks)
+
+
 class TestParseCompressedDna:
     def test_parse_compressed_dna(self):
         """Single 0x01 section decodes plain 2-bit DNA."""
@@ -328,6 +358,16 @@ class TestParseXml:
         result = parse_xml(b"this is not xml")
         assert result is None
 
+    def test_parse_xml_utf8_bytes(self):
+        """UTF-8 text is decoded by the parser"""
+        result = parse_xml("<Root>caf\u00e9</Root>".encode("utf-8"))
+        assert result["Root"] == "caf\u00e9"
+
+    def test_parse_xml_invalid_utf8_dropped(self):
+        """Invalid UTF-8 bytes are dropped rather than failing the block"""
+        result = parse_xml(b"<Root>ab\xffc</Root>")
+        assert result["Root"] == "abc"
+
 
 class TestParseLzmaXml:
     def test_parse_lzma_xml_valid(self):
@@ -362,6 +402,24 @@ class TestParseLzmaNested:
         result = parse_lzma_nested(b"invalid")
         assert result is None
 
+    def test_parse_lzma_nested_truncated_header(self):
+        """Truncated nested block header returns None"""
+        result = parse_lzma_nested(lzma.compress(b"\x00\x00\x00"))
+        assert result is None
+
+    def test_parse_trace_container_nested(self):
+        """Trace container flags are followed by nested TLV blocks"""
+        tlv_data = bytes([0]) + struct.pack(">I", 5) + bytes([0]) + b"ATCG"
+        result = parse_trace_container(struct.pack(">I", 7) + tlv_data)
+
+        assert result["flags"] == 7
+        assert result["blocks"][0][0]["sequence"] == "ATCG"
+
+    def test_parse_trace_container_truncated_flags(self):
+        """A trace container shorter than its flags word is rejected"""
+        with pytest.raises(struct.error):
+            parse_trace_container(b"\x01")
+
 
 # =============================================================================
 # Feature Parser Tests
@@ -502,6 +560,45 @@ class TestParseZtr:
         result = parse_ztr(b"short")
         assert result is None
 
+    def test_parse_ztr_bpos_ignores_partial_tail(self):
+        """BPOS positions stop at the last whole 4-byte value"""
+        chunk = b"\x00\x00\x00\x00" + struct.pack(">3I", 5, 17, 29) + b"\x01\x02"
+        data = _ztr(_ztr_chunk(b"BPOS", chunk))
+
+        result = parse_ztr(data)
+        assert result["positions"] == [5, 17, 29]
+
+    def test_parse_ztr_text_pairs(self):
+        """TEXT chunk decodes null-separated key/value pairs"""
+        chunk = b"\x00\x00NAME\x00sample1\x00MACH\x00ABI\x00"
+        data = _ztr(_ztr_chunk(b"TEXT", chunk))
+
+        result = parse_ztr(data)
+        assert result["text"] == {"NAME": "sample1", "MACH": "ABI"}
+
+    def test_parse_ztr_samp_channel(self):
+        """SAMP chunk stores one channel named by its metadata"""
+        chunk = b"\x00\x00" + struct.pack(">3H", 7, 8, 9) + b"\x01"
+        meta = b"G\x00\x00\x00"
+        data = _ztr(_ztr_chunk(b"SAMP", chunk, meta))
+
+        result = parse_ztr(data)
+        assert result["samples"] == {"G": [7, 8, 9]}
+
+    def test_parse_ztr_smp4_channels(self):
+        """SMP4 samples are split into contiguous ACGT channels"""
+        values = [1, 2, 10, 20, 100, 200, 1000, 2000]
+        chunk = b"\x00\x00" + struct.pack(">8H", *values)
+        data = _ztr(_ztr_chunk(b"SMP4", chunk))
+
+        result = parse_ztr(data)
+        assert result["samples"] == {
+            "A": [1, 2],
+            "C": [10, 20],
+            "G": [100, 200],
+            "T": [1000, 2000],
+        }
+
 
 # =============================================================================
 # History Parser Tests
@@ -634,6 +731,37 @@ class TestParseBlocks:
         result = parse_blocks(BytesIO(b""))
         assert result == {}
 
+    def test_parse_blocks_from_current_position(self):
+        """Parsing starts at the stream's current position"""
+        seq_data = bytes([0]) + b"ATCG"
+        stream = BytesIO(
+            b"HEADER"
+            + bytes([0])
+            + struct.pack(">I", len(seq_data))
+            + seq_data
+        )
+        stream.read(6)
+
+        result = parse_blocks(stream)
+        assert result[0][0]["sequence"] == "ATCG"
+
+    def test_parse_blocks_types_filter(self):
+        """Only requested block types are parsed"""
+        seq_data = bytes([0]) + b"ATCG"
+        notes_data = b"<Notes/>"
+        stream = BytesIO(
+            bytes([6])
+            + struct.pack(">I", len(notes_data))
+            + notes_data
+            + bytes([0])
+            + struct.pack(">I", len(seq_data))
+            + seq_data
+        )
+
+        result = parse_blocks(stream, types={0})
+        assert list(result) == [0]
+        assert result[0][0]["sequence"] == "ATCG"
+
 
 # =============================================================================
 # LZMA JSON Parser Tests
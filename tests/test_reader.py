@@ -2,7 +2,9 @@
 Tests for SgffReader class
 """
 
+import os
 import struct
+import threading
 from io import BytesIO
 
 import pytest
@@ -50,6 +52,35 @@ class TestSgffReaderConstructor:
         sgff = SgffReader.from_file(test_dna)
         assert isinstance(sgff, SgffObject)
 
+    def test_from_file_path_like(self, test_dna):
+        """Read using any os.PathLike object"""
+
+        class _PathLike:
+            def __fspath__(self):
+                return str(test_dna)
+
+        sgff = SgffReader(_PathLike()).read()
+        assert isinstance(sgff, SgffObject)
+
+    @pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="requires os.mkfifo")
+    def test_from_fifo_path(self, test_dna, tmp_path):
+        """Paths that cannot be mapped, like FIFOs, are read into memory"""
+        fifo = tmp_path / "input.dna"
+        os.mkfifo(fifo)
+        data = test_dna.read_bytes()
+
+        def feed():
+            with open(fifo, "wb") as f:
+                f.write(data)
+
+        writer = threading.Thread(target=feed)
+        writer.start()
+        try:
+            sgff = SgffReader.from_file(fifo)
+        finally:
+            writer.join()
+        assert sgff.blocks == SgffReader.from_bytes(data).blocks
+
     def test_from_bytes(self):
         """Read from bytes directly"""
         data = make_minimal_sgff()
@@ -106,11 +137,24 @@ class TestSgffReaderErrors:
         with pytest.raises(Exception):
             SgffReader.from_bytes(b"\t")
 
+    def test_truncated_cookie(self):
+        """Header without a complete cookie raises ValueError"""
+        data = b"\t" + struct.pack(">I", 14) + b"SnapGene" + b"\x00\x01"
+        with pytest.raises(ValueError, match="truncated header"):
+            SgffReader.from_bytes(data)
+
     def test_empty_file(self):
         """Empty file raises error"""
         with pytest.raises(Exception):
             SgffReader.from_bytes(b"")
 
+    def test_empty_file_on_disk(self, tmp_path):
+        """Empty file path raises the same error as empty bytes"""
+        path = tmp_path / "empty.dna"
+        path.write_bytes(b"")
+        with pytest.raises(ValueError, match="wrong magic byte"):
+            SgffReader.from_file(path)
+
 
 # =============================================================================
 # Cookie Parsing Tests
@@ -161,6 +205,12 @@ class TestSgffReaderBlocks:
         assert seq_block["topology"] == "linear"
         assert seq_block["strandedness"] == "single"
 
+    def test_types_filter(self, test_dna):
+        """Reader only parses requested block types"""
+        sgff = SgffReader(test_dna, types={0}).read()
+
+        assert sgff.types == [0]
+
 
 # =============================================================================
 # Real File Tests
@@ -3,7 +3,9 @@ Tests for SgffWriter class
 """
 
 import struct
+import sys
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 from pathlib import Path
 
@@ -143,6 +145,13 @@ class TestSgffWriterSequence:
         sgff = SgffReader.from_bytes(data)
         assert sgff.blocks[0][0]["sequence"] == "ATCG"
 
+    def test_sequence_bytes_and_non_ascii(self):
+        """Byte sequences pass through; non-ASCII text still encodes as UTF-8"""
+        writer = SgffWriter(BytesIO())
+        data = {"sequence": b"ATCG", "topology": "circular"}
+        assert writer._serialize_sequence(data) == b"\x01ATCG"
+        assert writer._serialize_sequence({"sequence": "AT\u00e9"}) == b"\x00AT\xc3\xa9"
+
     def test_write_sequence_block_21(self, sample_cookie):
         """Protein sequence"""
         obj = SgffObject(cookie=sample_cookie)
@@ -403,6 +412,62 @@ class TestSgffWriterXml:
 
         assert 6 in sgff.blocks
 
+    def test_xml_reflects_changes_after_reuse(self):
+        """Reused XML output never hides later edits to the block"""
+        writer = SgffWriter(BytesIO())
+        notes = {"Notes": {"Note": "first"}}
+        first = writer._serialize_xml(notes)
+        assert writer._serialize_xml(notes) == first
+
+        notes["Notes"]["Note"] = "second"
+        assert b"second" in writer._serialize_xml(notes)
+        assert writer._serialize_xml(notes, xml_declaration=True).startswith(b"<?xml")
+
+    def test_xml_error_keeps_cause(self):
+        """Unserializable dicts raise ValueError chained to the original error"""
+        writer = SgffWriter(BytesIO())
+        with pytest.raises(ValueError, match="Cannot serialize") as exc:
+            writer._serialize_xml({"Bad Name": "x"})
+        assert isinstance(exc.value.__cause__, ValueError)
+
+    def test_xml_reuse_matches_direct_unparse(self):
+        """Blocks that JSON cannot represent exactly serialize like xmltodict does"""
+        writer = SgffWriter(BytesIO())
+        # A tuple and a list share JSON text but not XML output
+        for data in ({"Root": {"ID": ()}}, {"Root": {"ID": []}}):
+            for _ in range(2):
+                assert writer._serialize_xml(data) == SgffWriter._unparse_xml(
+                    data, False
+                )
+
+        # Non-str keys still fail instead of being stringified by JSON
+        for data in ({"Root": {True: "x"}}, {"Root": {None: "x"}}):
+            with pytest.raises(ValueError, match="Cannot serialize"):
+                SgffWriter._unparse_xml(data, False)
+            with pytest.raises(ValueError, match="Cannot serialize"):
+                writer._serialize_xml(data)
+
+    def test_xml_shared_across_threads(self):
+        """Writers in separate threads serialize XML blocks concurrently"""
+
+        def serialize(worker):
+            writer = SgffWriter(BytesIO())
+            return [
+                writer._serialize_xml({"Notes": {"Note": f"{worker}-{i}"}})
+                for i in range(1000)
+            ]
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # force frequent thread switches
+        try:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                results = list(pool.map(serialize, range(8)))
+        finally:
+            sys.setswitchinterval(interval)
+
+        for worker, outputs in enumerate(results):
+            assert outputs[-1] == f"<Notes><Note>{worker}-999</Note></Notes>".encode()
+
 
 # =============================================================================
 # Features Block Tests
@@ -444,6 +509,41 @@ class TestSgffWriterFeatures:
 
         assert 10 in sgff.blocks
 
+    def test_direct_features_xml_matches_xmltodict(self):
+        """Directly emitted Features XML is identical to the xmltodict output"""
+        writer = SgffWriter(BytesIO())
+        features = [
+            {
+                "name": 'say "hi" & <bye>',
+                "type": "misc_feature",
+                "strand": "-",
+                "extras": {"ID": "3", "allowSegmentOverlaps": "0"},
+                "segments": [{"range": "1-4", "color": "#a6acb3"}],
+                "qualifiers": {"note": ["it's\tfine", 7]},
+            }
+        ]
+        wrapper = {"nextValidID": "4"}
+        direct = writer._emit_features(features, wrapper)
+        assert direct == writer._unparse_features(features, wrapper)
+        assert b'name=\'say "hi" &amp; &lt;bye&gt;\'' in direct
+
+    def test_empty_features_roundtrip(self, sample_cookie):
+        """An empty feature list writes a bare Features element that reads back"""
+        obj = SgffObject(cookie=sample_cookie)
+        obj.blocks = {10: [{"features": []}]}
+        data = SgffWriter.to_bytes(obj)
+        assert b'<?xml version="1.0"?><Features/>' in data
+
+        sgff = SgffReader.from_bytes(data)
+        assert sgff.blocks[10][0]["features"] == []
+
+    def test_features_fall_back_for_unmodeled_values(self):
+        """Values outside the direct emitter's model still serialize"""
+        writer = SgffWriter(BytesIO())
+        data = {"features": [{"name": "f", "extras": {"note": b"raw"}}]}
+        xml = writer._serialize_features(data)
+        assert b'note="raw"' in xml
+
 
 # =============================================================================
 # Real File Roundtrip Tests